@@ -23,9 +23,97 @@ logger = logging.getLogger(__name__)
 # Global registry structure
 _action_registry = {
     "anytime": {},   # action_id -> {label, plugin_id, callback}
-    "display": {},   # plugin_id -> [callback_0, callback_1, ...]
+    "display": {},   # plugin_id -> (callback_0, callback_1, ...)
 }
-_registry_lock = threading.Lock()
+
+
+class _RWLock:
+    """Reader-preferring readers/writer lock.
+
+    Any number of readers may hold the lock at once; a writer waits until no
+    readers remain. Registration (writes) only happens at plugin import time,
+    while lookups (reads) happen on every button press and dropdown fetch.
+    """
+
+    def __init__(self):
+        # Plain Lock rather than Condition's default RLock: the critical
+        # sections never re-enter, so skip the reentrancy bookkeeping.
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+
+    def acquire_read(self):
+        with self._cond:
+            while self._writer:
+                self._cond.wait()
+            self._readers += 1
+
+    def release_read(self):
+        with self._cond:
+            self._readers -= 1
+            if not self._readers:
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        with self._cond:
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writer = True
+
+    def release_write(self):
+        with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+
+
+class _ReadLock:
+    """Context manager holding an _RWLock in shared (read) mode."""
+
+    def __init__(self, rw):
+        self.acquire = rw.acquire_read
+        self.release = rw.release_read
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class _WriteLock:
+    """Context manager holding an _RWLock in exclusive (write) mode."""
+
+    def __init__(self, rw):
+        self.acquire = rw.acquire_write
+        self.release = rw.release_write
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+_registry_lock = _RWLock()
+_read_lock = _ReadLock(_registry_lock)
+_write_lock = _WriteLock(_registry_lock)
+
+# Read-only copies of the registry, rebuilt and reassigned (atomically under the
+# GIL) after every registration. Hot lookups from GPIO callbacks read these
+# without taking any lock; registration is rare and happens at plugin import.
+_anytime_snapshot = {}   # action_id -> {label, plugin_id, callback}
+_display_flat = {}       # (plugin_id, index) -> callback
+
+# Sorted tuple returned by get_all_anytime_actions(); None until built or after a registration
+_anytime_actions_cache = None
+
+# Bumped on every registration so callers can key caches on registry contents
+_registry_version = 0
+
+# Largest display-action list registered by any plugin; recomputed on registration
+_max_display_count = 0
 
 # Maximum display actions per plugin (keeps dropdown manageable)
 MAX_DISPLAY_ACTIONS = 6
@@ -82,80 +170,112 @@ def register_actions(plugin_id, anytime_actions=None, display_actions=None):
         logger.warning("register_actions: invalid plugin_id (must be non-empty string): %s", plugin_id)
         return
     
-    with _registry_lock:
-        # Register anytime actions
-        if anytime_actions:
-            if not isinstance(anytime_actions, dict):
-                logger.warning("register_actions: anytime_actions must be a dict for plugin %s", plugin_id)
-            else:
-                for action_name, action_config in anytime_actions.items():
-                    if not isinstance(action_config, dict):
-                        logger.warning("register_actions: anytime_actions[%s] must be a dict for plugin %s", action_name, plugin_id)
-                        continue
-                    
-                    label = action_config.get("label")
-                    callback = action_config.get("callback")
-                    
-                    if not label or not isinstance(label, str):
-                        logger.warning("register_actions: anytime action %s.%s missing valid label", plugin_id, action_name)
-                        continue
-                    
-                    if not callable(callback):
-                        logger.warning("register_actions: anytime action %s.%s callback is not callable", plugin_id, action_name)
-                        continue
-                    
-                    action_id = f"{plugin_id}_{action_name}"
-                    _action_registry["anytime"][action_id] = {
-                        "label": label,
-                        "plugin_id": plugin_id,
-                        "callback": callback,
-                    }
-                    logger.info("Registered anytime action: %s (label: %s)", action_id, label)
-        
-        # Register display actions
-        if display_actions:
-            if not isinstance(display_actions, list):
-                logger.warning("register_actions: display_actions must be a list for plugin %s", plugin_id)
-            else:
-                # Validate all are callables
-                valid_actions = []
-                for i, action in enumerate(display_actions):
-                    if not callable(action):
-                        logger.warning("register_actions: display_actions[%d] is not callable for plugin %s", i, plugin_id)
-                        continue
-                    valid_actions.append(action)
+    # Validate outside the lock; the write lock only covers the dict mutation
+    new_anytime = {}
+    if anytime_actions:
+        if not isinstance(anytime_actions, dict):
+            logger.warning("register_actions: anytime_actions must be a dict for plugin %s", plugin_id)
+        else:
+            for action_name, action_config in anytime_actions.items():
+                if not isinstance(action_config, dict):
+                    logger.warning("register_actions: anytime_actions[%s] must be a dict for plugin %s", action_name, plugin_id)
+                    continue
+                
+                label = action_config.get("label")
+                callback = action_config.get("callback")
                 
-                if len(valid_actions) > MAX_DISPLAY_ACTIONS:
-                    logger.warning(
-                        "register_actions: plugin %s registered %d display actions, limiting to %d",
-                        plugin_id, len(valid_actions), MAX_DISPLAY_ACTIONS
-                    )
-                    valid_actions = valid_actions[:MAX_DISPLAY_ACTIONS]
+                if not label or not isinstance(label, str):
+                    logger.warning("register_actions: anytime action %s.%s missing valid label", plugin_id, action_name)
+                    continue
                 
-                if valid_actions:
-                    _action_registry["display"][plugin_id] = valid_actions
-                    logger.info("Registered %d display action(s) for plugin %s", len(valid_actions), plugin_id)
+                if not callable(callback):
+                    logger.warning("register_actions: anytime action %s.%s callback is not callable", plugin_id, action_name)
+                    continue
+                
+                new_anytime[f"{plugin_id}_{action_name}"] = {
+                    "label": label,
+                    "plugin_id": plugin_id,
+                    "callback": callback,
+                }
+    
+    valid_actions = []
+    if display_actions:
+        if not isinstance(display_actions, list):
+            logger.warning("register_actions: display_actions must be a list for plugin %s", plugin_id)
+        else:
+            # Validate all are callables
+            for i, action in enumerate(display_actions):
+                if not callable(action):
+                    logger.warning("register_actions: display_actions[%d] is not callable for plugin %s", i, plugin_id)
+                    continue
+                valid_actions.append(action)
+            
+            if len(valid_actions) > MAX_DISPLAY_ACTIONS:
+                logger.warning(
+                    "register_actions: plugin %s registered %d display actions, limiting to %d",
+                    plugin_id, len(valid_actions), MAX_DISPLAY_ACTIONS
+                )
+                valid_actions = valid_actions[:MAX_DISPLAY_ACTIONS]
+    
+    if not new_anytime and not valid_actions:
+        return
+    
+    global _anytime_snapshot, _display_flat, _anytime_actions_cache, _max_display_count, _registry_version
+    with _write_lock:
+        _registry_version += 1
+        if new_anytime:
+            _action_registry["anytime"].update(new_anytime)
+            _anytime_snapshot = dict(_action_registry["anytime"])
+            _anytime_actions_cache = None
+        if valid_actions:
+            previous = _action_registry["display"].get(plugin_id)
+            _action_registry["display"][plugin_id] = tuple(valid_actions)
+            if previous and len(previous) == _max_display_count and len(valid_actions) < len(previous):
+                # Re-registered with fewer actions; the max may have shrunk
+                _max_display_count = max(len(a) for a in _action_registry["display"].values())
+            else:
+                _max_display_count = max(_max_display_count, len(valid_actions))
+            _display_flat = {
+                (pid, i): callback
+                for pid, callbacks in _action_registry["display"].items()
+                for i, callback in enumerate(callbacks)
+            }
+    
+    for action_id, action_info in new_anytime.items():
+        logger.info("Registered anytime action: %s (label: %s)", action_id, action_info["label"])
+    if valid_actions:
+        logger.info("Registered %d display action(s) for plugin %s", len(valid_actions), plugin_id)
 
 
 def get_all_anytime_actions():
     """Get all registered anytime actions for dropdown population.
     
+    The result is cached until the next register_actions() call and shared
+    between callers; treat it as read-only.
+    
     Returns:
-        List of dicts: [{"id": str, "label": str, "group": str, "plugin_id": str}, ...]
+        Tuple of dicts: ({"id": str, "label": str, "group": str, "plugin_id": str}, ...)
         Sorted by label for consistent UI ordering.
     """
-    with _registry_lock:
-        actions = []
-        for action_id, action_info in _action_registry["anytime"].items():
-            actions.append({
-                "id": action_id,
-                "label": action_info["label"],
-                "group": "Other Plugins",
-                "plugin_id": action_info["plugin_id"],
-            })
-        # Sort by label for consistent ordering
-        actions.sort(key=lambda a: a["label"].lower())
-        return actions
+    global _anytime_actions_cache
+    with _read_lock:
+        cached = _anytime_actions_cache
+    if cached is not None:
+        return cached
+    with _write_lock:
+        if _anytime_actions_cache is None:
+            actions = []
+            for action_id, action_info in _action_registry["anytime"].items():
+                actions.append({
+                    "id": action_id,
+                    "label": action_info["label"],
+                    "group": "Other Plugins",
+                    "plugin_id": action_info["plugin_id"],
+                })
+            # Sort by label for consistent ordering
+            actions.sort(key=lambda a: a["label"].lower())
+            _anytime_actions_cache = tuple(actions)
+        return _anytime_actions_cache
 
 
 def get_max_display_action_count():
@@ -166,10 +286,16 @@ def get_max_display_action_count():
     Returns:
         int: Maximum display action count (0 if no plugins registered display actions)
     """
-    with _registry_lock:
-        if not _action_registry["display"]:
-            return 0
-        return max(len(actions) for actions in _action_registry["display"].values())
+    return _max_display_count
+
+
+def get_registry_version():
+    """Return a counter that changes whenever actions are registered.
+    
+    Returns:
+        int: Registry version (0 before any registration)
+    """
+    return _registry_version
 
 
 def get_display_action(plugin_id, action_index):
@@ -182,11 +308,7 @@ def get_display_action(plugin_id, action_index):
     Returns:
         callable or None: The action callback if it exists, None otherwise
     """
-    with _registry_lock:
-        actions = _action_registry["display"].get(plugin_id)
-        if not actions or action_index < 0 or action_index >= len(actions):
-            return None
-        return actions[action_index]
+    return _display_flat.get((plugin_id, action_index))
 
 
 def execute_plugin_action(action_id, refs):
@@ -200,8 +322,7 @@ def execute_plugin_action(action_id, refs):
         ValueError: If action_id is not registered
         Exception: Re-raises any exception from the callback after logging
     """
-    with _registry_lock:
-        action_info = _action_registry["anytime"].get(action_id)
+    action_info = _anytime_snapshot.get(action_id)
     
     if not action_info:
         raise ValueError(f"Action {action_id} is not registered")
@@ -248,25 +369,14 @@ def execute_display_action(action_index, refs):
         return False
     
     # Look up display action for current plugin
-    with _registry_lock:
-        actions = _action_registry["display"].get(current_plugin_id)
-    
-    if not actions:
+    callback = _display_flat.get((current_plugin_id, action_index))
+    if callback is None:
         logger.debug(
-            "execute_display_action: plugin %s has no display actions registered (action_index=%d)",
+            "execute_display_action: plugin %s has no display action at index %d",
             current_plugin_id, action_index
         )
         return False
     
-    if action_index < 0 or action_index >= len(actions):
-        logger.debug(
-            "execute_display_action: plugin %s only has %d display action(s), cannot execute index %d",
-            current_plugin_id, len(actions), action_index
-        )
-        return False
-    
-    callback = actions[action_index]
-    
     # Resolve current plugin instance if available
     current_instance = None
     if refresh_info.refresh_type == "Playlist":
@@ -278,9 +388,8 @@ def execute_display_action(action_index, refs):
             if playlist:
                 current_instance = playlist.find_plugin(current_plugin_id, instance_name)
     
-    # Add current_plugin_instance to refs for display actions
-    refs_with_instance = dict(refs)
-    refs_with_instance["current_plugin_instance"] = current_instance
+    # Add current_plugin_instance to a copy of refs for display actions
+    refs_with_instance = {**refs, "current_plugin_instance": current_instance}
     
     logger.info(
         "Executing display action %d for plugin %s (instance: %s)",
@@ -305,7 +414,7 @@ def get_registry_stats():
     Returns:
         dict: {"anytime_count": int, "plugins_with_display": int, "max_display": int}
     """
-    with _registry_lock:
+    with _read_lock:
         return {
             "anytime_count": len(_action_registry["anytime"]),
             "plugins_with_display": len(_action_registry["display"]),
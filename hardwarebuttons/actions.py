@@ -1,18 +1,75 @@
 """Built-in action definitions and executor for hardware button bindings."""
 
 import os
+import functools
+import http.client
 import logging
+import shutil
+import socket
 import subprocess
 import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime
 from . import action_registry
 
 logger = logging.getLogger(__name__)
 
+# Core modules needed by playlist actions; only importable inside a running InkyPi
+try:
+    from refresh_task import PlaylistRefresh
+    import pytz
+    _CORE_IMPORTS_OK = True
+except ImportError:
+    PlaylistRefresh = None
+    pytz = None
+    _CORE_IMPORTS_OK = False
+
+# Optional requests (ships with InkyPi core): one pooled keep-alive session for
+# call_url so repeated presses reuse the connection. Falls back to urllib.
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:
+    requests = None
+
+if requests is not None:
+    _http = requests.Session()
+    # No adapter-level retries: a retried GET re-fires the webhook and doubles the
+    # wait on a read timeout. _http_get_status() retries by hand only for a dropped
+    # keep-alive connection.
+    _http.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+    _http.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+    _HTTP_ERRORS = (urllib.error.URLError, socket.timeout, requests.RequestException)
+else:
+    _http = None
+    _HTTP_ERRORS = (urllib.error.URLError, socket.timeout)
+
+# Hosts (scheme://netloc) with a completed request on _http: only their requests can
+# go out on a pooled keep-alive connection that the server may have closed meanwhile
+_http_used_hosts = set()
+
+# Absolute executable paths, resolved once. For the fixed system commands, together
+# with close_fds=False and no cwd/preexec_fn/start_new_session, this keeps subprocess
+# on CPython's posix_spawn fast path (no fork page-table copy). User scripts keep the
+# default close_fds=True so they never inherit descriptors (e.g. spidev/GPIO handles).
+_BASH = shutil.which("bash") or "bash"
+_SUDO = shutil.which("sudo") or "sudo"
+
+# Timezone name -> pytz tzinfo, filled by _get_tz()
+_tz_cache = {}
+
+# Scripts are restricted to the service account home directory (resolved once)
+_HOME_DIR = os.path.realpath(os.path.expanduser("~"))
+_HOME_PREFIX = os.path.join(_HOME_DIR, "")
+
 # Only one action runs at a time; further triggers are ignored until it returns.
 _action_lock = threading.Lock()
+_action_running = False  # mirrors _action_lock being held; read without locking
 
 # Action IDs that are built-in (not plugin-registered)
-BUILTIN_ACTION_IDS = {
+BUILTIN_ACTION_IDS = frozenset({
     "core_trigger_refresh",
     "core_force_refresh",
     "core_next_playlist",
@@ -22,62 +79,74 @@ BUILTIN_ACTION_IDS = {
     "system_restart_inkypi",
     "external_script",
     "call_url",
+})
+
+# "display_action_N" -> N, for every index a plugin may register
+_DISPLAY_ACTION_IDS = {
+    f"display_action_{i}": i for i in range(action_registry.MAX_DISPLAY_ACTIONS)
+}
+
+# Built-in actions that need no playlist state: action_id -> handler(refs, context)
+_HANDLERS = {
+    "external_script": lambda refs, context: _run_external_script(context),
+    "call_url": lambda refs, context: _call_url(context),
+    "system_shutdown": lambda refs, context: _system_shutdown(refs.get("app"), reboot=False),
+    "system_reboot": lambda refs, context: _system_shutdown(refs.get("app"), reboot=True),
+    "system_restart_inkypi": lambda refs, context: _restart_inkypi_service(),
 }
 
 
 def execute_action(refs, action_id, context=None):
     """Execute a button action. Only one action runs at a time; other triggers are ignored until it returns.
 
+    Runs inline on the calling thread (no watchdog thread): every blocking step
+    (scripts, URL calls, system commands) carries its own timeout.
+
     refs = dict with device_config, refresh_task, app (optional).
     context: optional dict with script_path for external_script, url for call_url, etc.
     """
-    logger.debug("execute_action called: action_id=%s", action_id)
     if not action_id or action_id == "none":
-        logger.debug("execute_action: empty/none action_id -> no-op")
         return
-    if not _action_lock.acquire(blocking=False):
+    _run_gated(refs, action_id, _resolve_handler(action_id), context or {})
+
+
+def resolve(refs, action_id, context=None):
+    """Resolve an action once and return a no-argument callable that runs it.
+
+    Calling the result behaves like execute_action(refs, action_id, context), without
+    repeating the action_id dispatch on every trigger. Returns None for "no action".
+    Plugin actions are still looked up in action_registry when run, since plugins may
+    (re-)register them at any time.
+    """
+    if not action_id or action_id == "none":
+        return None
+    handler = _resolve_handler(action_id)
+    context = context or {}
+
+    def run():
+        _run_gated(refs, action_id, handler, context)
+    return run
+
+
+def _run_gated(refs, action_id, handler, context):
+    """Run handler(refs, context) unless another action is in progress."""
+    global _action_running
+    # Cheap pre-check so repeated triggers while busy skip the lock entirely;
+    # the lock below remains the authoritative gate.
+    if _action_running or not _action_lock.acquire(blocking=False):
         logger.debug("Action already in progress, ignoring trigger for %s", action_id)
         return
+    _action_running = True
     try:
-        logger.debug("execute_action: lock acquired, running action %s", action_id)
-        _run_action_impl(refs, action_id, context or {})
-        logger.debug("execute_action: action %s finished", action_id)
+        logger.debug("execute_action: running action %s", action_id)
+        handler(refs, context)
     finally:
+        _action_running = False
         _action_lock.release()
-        logger.debug("execute_action: lock released")
 
 
-def _run_action_impl(refs, action_id, context):
-    """Core logic; no locking. Called with _action_lock held by execute_action()."""
-    logger.debug("_run_action_impl: action_id=%s", action_id)
-    device_config = refs.get("device_config")
-    refresh_task = refs.get("refresh_task")
-    app = refs.get("app")
-
-    # Handle actions with special context requirements first
-    if action_id == "external_script":
-        logger.debug("_run_action_impl: running external_script")
-        _run_external_script(context)
-        return
-    if action_id == "call_url":
-        logger.debug("_run_action_impl: running call_url")
-        _call_url(context)
-        return
-    
-    # Handle system actions
-    if action_id == "system_shutdown":
-        logger.debug("_run_action_impl: running system_shutdown")
-        _system_shutdown(app, reboot=False)
-        return
-    if action_id == "system_reboot":
-        logger.debug("_run_action_impl: running system_reboot")
-        _system_shutdown(app, reboot=True)
-        return
-    if action_id == "system_restart_inkypi":
-        logger.debug("_run_action_impl: running system_restart_inkypi")
-        _restart_inkypi_service()
-        return
-    
+def _resolve_handler(action_id):
+    """Map action_id to its handler(refs, context). No locking; nothing is run here."""
     # ===== Plugin-Registered Actions =====
     # Plugins can register two types of actions via action_registry:
     # 1. Display actions: context-dependent, only work when that plugin is displayed
@@ -85,100 +154,131 @@ def _run_action_impl(refs, action_id, context):
     
     # Check for display actions (display_action_0, display_action_1, etc.)
     # These are resolved to the currently displayed plugin's action array
-    if action_id.startswith("display_action_"):
-        try:
-            action_index = int(action_id.split("_")[-1])
-            logger.debug("_run_action_impl: display action index %d", action_index)
-            action_registry.execute_display_action(action_index, refs)
-            return
-        except (ValueError, IndexError) as e:
-            logger.warning("_run_action_impl: invalid display_action format: %s (%s)", action_id, e)
-            return
-        except Exception as e:
-            logger.exception("_run_action_impl: display action %s failed: %s", action_id, e)
-            return
+    action_index = _DISPLAY_ACTION_IDS.get(action_id)
+    if action_index is not None:
+        return functools.partial(_run_display_action, action_id, action_index)
     
-    # Check for plugin-registered anytime actions (e.g., "weather_reload", "calendar_sync")
+    # Anything not built in must be a plugin-registered anytime action (e.g., "weather_reload")
     if action_id not in BUILTIN_ACTION_IDS:
-        # Could be a plugin action; try to execute it
-        try:
-            action_registry.execute_plugin_action(action_id, refs)
-            return
-        except ValueError:
-            # Not a registered plugin action; fall through to core actions or unknown
-            pass
-        except Exception as e:
-            logger.exception("_run_action_impl: plugin action %s failed: %s", action_id, e)
-            return
-
-    # Core playlist actions require refresh_task and device_config
+        return functools.partial(_run_plugin_action, action_id)
+    
+    # Built-in actions with no playlist dependency (scripts, URLs, system commands)
+    handler = _HANDLERS.get(action_id)
+    if handler is not None:
+        return handler
+
+    # Core playlist actions
+    return functools.partial(_run_core_action, action_id)
+
+
+def _run_display_action(action_id, action_index, refs, context):
+    logger.debug("_run_display_action: display action index %d", action_index)
+    try:
+        action_registry.execute_display_action(action_index, refs)
+    except Exception as e:
+        logger.exception("_run_display_action: display action %s failed: %s", action_id, e)
+
+
+def _run_plugin_action(action_id, refs, context):
+    try:
+        action_registry.execute_plugin_action(action_id, refs)
+    except ValueError:
+        logger.warning("Unknown action_id: %s", action_id)
+    except Exception as e:
+        logger.exception("_run_plugin_action: plugin action %s failed: %s", action_id, e)
+
+
+def _run_core_action(action_id, refs, context):
+    """Core playlist actions require refresh_task and device_config."""
+    device_config = refs.get("device_config")
+    refresh_task = refs.get("refresh_task")
     if not refresh_task or not device_config:
         logger.warning("Cannot run core action %s: missing refresh_task or device_config", action_id)
         return
 
-    try:
-        from refresh_task import PlaylistRefresh
-        import pytz
-        from datetime import datetime
-    except ImportError:
-        logger.exception("Import error in execute_action")
+    if not _CORE_IMPORTS_OK:
+        logger.error("Cannot run core action %s: refresh_task/pytz not importable", action_id)
+        return
+
+    handler = _CORE_HANDLERS.get(action_id)
+    if handler is None:
+        logger.warning("Unknown action_id: %s", action_id)
         return
 
-    playlist_manager = device_config.get_playlist_manager()
-    tz = pytz.timezone(device_config.get_config("timezone", default="UTC"))
-    now = datetime.now(tz)
+    handler(device_config, refresh_task, device_config.get_playlist_manager())
 
-    if action_id in ("core_trigger_refresh", "core_next_playlist"):
-        logger.debug("_run_action_impl: core next/trigger refresh -> get next playlist item")
-        active_name = playlist_manager.active_playlist
-        if not active_name:
-            playlist = playlist_manager.determine_active_playlist(now)
-        else:
-            playlist = playlist_manager.get_playlist(active_name)
-        if not playlist or not playlist.plugins:
-            logger.info("No active playlist or no plugins for next/trigger refresh")
-            return
-        plugin_instance = playlist.get_next_plugin()
-        logger.debug("_run_action_impl: manual_update PlaylistRefresh playlist=%s instance=%s", playlist.name, plugin_instance.name)
-        refresh_task.manual_update(PlaylistRefresh(playlist, plugin_instance, force=True))
+
+def _active_playlist(device_config, playlist_manager):
+    """Return the active playlist; the timezone-aware "now" is only computed when none is set."""
+    active_name = playlist_manager.active_playlist
+    if active_name:
+        return playlist_manager.get_playlist(active_name)
+    tz = _get_tz(device_config.get_config("timezone", default="UTC"))
+    return playlist_manager.determine_active_playlist(datetime.now(tz))
+
+
+def _handle_core_next(device_config, refresh_task, playlist_manager):
+    """core_trigger_refresh / core_next_playlist: show the next playlist item."""
+    logger.debug("_handle_core_next: core next/trigger refresh -> get next playlist item")
+    playlist = _active_playlist(device_config, playlist_manager)
+    if not playlist or not playlist.plugins:
+        logger.info("No active playlist or no plugins for next/trigger refresh")
         return
+    plugin_instance = playlist.get_next_plugin()
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("_handle_core_next: manual_update PlaylistRefresh playlist=%s instance=%s", playlist.name, plugin_instance.name)
+    refresh_task.manual_update(PlaylistRefresh(playlist, plugin_instance, force=True))
 
-    if action_id == "core_force_refresh":
-        logger.debug("_run_action_impl: core_force_refresh -> re-show current")
-        refresh_info = device_config.get_refresh_info()
-        if not refresh_info or not getattr(refresh_info, "playlist", None) or not getattr(refresh_info, "plugin_instance", None):
-            logger.info("Force refresh only supported when last refresh was from playlist")
-            return
-        playlist = playlist_manager.get_playlist(refresh_info.playlist)
-        if not playlist:
-            return
-        instance = playlist.find_plugin(refresh_info.plugin_id, refresh_info.plugin_instance)
-        if not instance:
-            return
-        logger.debug("_run_action_impl: manual_update PlaylistRefresh force current")
-        refresh_task.manual_update(PlaylistRefresh(playlist, instance, force=True))
+
+def _handle_core_force(device_config, refresh_task, playlist_manager):
+    """core_force_refresh: re-show the current playlist item."""
+    logger.debug("_handle_core_force: core_force_refresh -> re-show current")
+    refresh_info = device_config.get_refresh_info()
+    if not refresh_info or not getattr(refresh_info, "playlist", None) or not getattr(refresh_info, "plugin_instance", None):
+        logger.info("Force refresh only supported when last refresh was from playlist")
+        return
+    playlist = playlist_manager.get_playlist(refresh_info.playlist)
+    if not playlist:
         return
+    instance = playlist.find_plugin(refresh_info.plugin_id, refresh_info.plugin_instance)
+    if not instance:
+        return
+    logger.debug("_handle_core_force: manual_update PlaylistRefresh force current")
+    refresh_task.manual_update(PlaylistRefresh(playlist, instance, force=True))
 
-    if action_id == "core_prev_playlist":
-        logger.debug("_run_action_impl: core_prev_playlist -> previous item and write_config")
-        active_name = playlist_manager.active_playlist
-        if not active_name:
-            playlist = playlist_manager.determine_active_playlist(now)
-        else:
-            playlist = playlist_manager.get_playlist(active_name)
-        if not playlist or not playlist.plugins:
-            return
-        idx = playlist.current_plugin_index
-        if idx is None:
-            idx = 0
-        prev_idx = (idx - 1) % len(playlist.plugins)
-        playlist.current_plugin_index = prev_idx
-        instance = playlist.plugins[prev_idx]
-        refresh_task.manual_update(PlaylistRefresh(playlist, instance, force=True))
-        device_config.write_config()
+
+def _handle_core_prev(device_config, refresh_task, playlist_manager):
+    """core_prev_playlist: step back one playlist item and persist the index."""
+    logger.debug("_handle_core_prev: core_prev_playlist -> previous item and write_config")
+    playlist = _active_playlist(device_config, playlist_manager)
+    if not playlist or not playlist.plugins:
         return
+    idx = playlist.current_plugin_index
+    if idx is None:
+        idx = 0
+    prev_idx = (idx - 1) % len(playlist.plugins)
+    playlist.current_plugin_index = prev_idx
+    instance = playlist.plugins[prev_idx]
+    refresh_task.manual_update(PlaylistRefresh(playlist, instance, force=True))
+    device_config.write_config()
+
+
+# Core playlist actions: action_id -> handler(device_config, refresh_task, playlist_manager)
+_CORE_HANDLERS = {
+    "core_trigger_refresh": _handle_core_next,
+    "core_next_playlist": _handle_core_next,
+    "core_force_refresh": _handle_core_force,
+    "core_prev_playlist": _handle_core_prev,
+}
+
 
-    logger.warning("Unknown action_id: %s", action_id)
+def _get_tz(name):
+    """Return the pytz timezone for name, parsed once per name."""
+    tz = _tz_cache.get(name)
+    if tz is None:
+        tz = pytz.timezone(name)
+        _tz_cache[name] = tz
+    return tz
 
 
 def _run_external_script(context):
@@ -187,30 +287,24 @@ def _run_external_script(context):
     if not script_path:
         logger.warning("external_script: no script_path in context")
         return
-    # Expand ~ to home directory before validation
-    script_path = os.path.expanduser(script_path)
-    script_path = os.path.realpath(script_path)
+    # Expand ~ to home directory before validation (realpath always returns an absolute path)
+    script_path = os.path.realpath(os.path.expanduser(script_path))
     logger.debug("_run_external_script: expanded path=%s", script_path)
     # Restrict scripts to the service account home directory.
     # This keeps execution predictable and avoids running arbitrary system paths.
-    home_dir = os.path.realpath(os.path.expanduser("~"))
-    home_prefix = os.path.join(home_dir, "")
-    if not os.path.isabs(script_path):
-        logger.warning("external_script: path must be absolute (after expanding ~): %s", script_path)
-        return
-    if not script_path.startswith(home_prefix):
-        logger.warning("external_script: path must be under %s: %s", home_dir, script_path)
+    if not script_path.startswith(_HOME_PREFIX):
+        logger.warning("external_script: path must be under %s: %s", _HOME_DIR, script_path)
         return
     if not os.path.isfile(script_path):
         logger.warning("external_script: file not found: %s", script_path)
         return
     logger.debug("_run_external_script: executing bash %s (timeout=30s)", script_path)
     try:
+        script_dir = os.path.dirname(script_path)
         subprocess.run(
-            ["bash", script_path],
+            [_BASH, script_path],
             timeout=30,
-            cwd=os.path.dirname(script_path),
-            env=os.environ.copy(),
+            cwd=script_dir,
             check=False,
         )
     except subprocess.TimeoutExpired:
@@ -220,7 +314,7 @@ def _run_external_script(context):
 
 
 def _call_url(context):
-    """Call a URL via curl when button is triggered."""
+    """Call a URL (HTTP GET) when button is triggered."""
     url = (context.get("url") or "").strip()
     logger.debug("_call_url: url=%s", url or "(empty)")
     if not url:
@@ -232,26 +326,62 @@ def _call_url(context):
         return
     logger.info("call_url: calling URL %s", url)
     try:
-        # Use curl with timeout and follow redirects
-        result = subprocess.run(
-            ["curl", "-s", "-f", "-L", "--max-time", "10", url],
-            timeout=15,
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-        if result.returncode == 0:
-            logger.debug("call_url: successfully called %s (status=%d)", url, result.returncode)
+        # In-process GET (follows redirects); no curl fork/exec per press
+        if _http is not None:
+            status = _http_get_status(url)
         else:
-            logger.warning("call_url: curl returned non-zero exit code %d for %s", result.returncode, url)
-            if result.stderr:
-                logger.debug("call_url: curl stderr: %s", result.stderr[:200])
-    except subprocess.TimeoutExpired:
-        logger.warning("call_url: timeout calling %s", url)
-    except FileNotFoundError:
-        logger.warning("call_url: curl command not found, cannot call URL")
+            request = urllib.request.Request(url, method="GET")
+            with urllib.request.urlopen(request, timeout=10) as response:
+                status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except _HTTP_ERRORS as e:
+        logger.warning("call_url: could not reach %s: %s", url, getattr(e, "reason", e))
+        return
     except Exception as e:
         logger.warning("call_url: error calling %s: %s", url, e)
+        return
+    if status >= 400:
+        logger.warning("call_url: HTTP error %d for %s", status, url)
+    else:
+        logger.debug("call_url: successfully called %s (status=%d)", url, status)
+
+
+def _http_get_status(url):
+    """GET url on the pooled session and return the status code.
+
+    Retries once, and only when a request to an already-used host failed because the
+    server had dropped the kept-alive connection. Never retries a timeout: the server
+    may have received the request, and a retry would fire the webhook twice.
+    """
+    parts = urllib.parse.urlsplit(url)
+    host = f"{parts.scheme}://{parts.netloc}"
+    try:
+        status = _http.get(url, timeout=10).status_code
+    except requests.ConnectionError as e:
+        if isinstance(e, requests.Timeout) or host not in _http_used_hosts or not _is_dropped_connection(e):
+            raise
+        logger.debug("call_url: pooled connection to %s was closed, retrying once", host)
+        status = _http.get(url, timeout=10).status_code
+    _http_used_hosts.add(host)
+    return status
+
+
+def _is_dropped_connection(error):
+    """True if error was caused by the peer closing the connection before answering."""
+    pending = [error]
+    seen = set()
+    while pending:
+        err = pending.pop()
+        if id(err) in seen:
+            continue
+        seen.add(id(err))
+        if isinstance(err, (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)):
+            return True
+        if isinstance(err, BaseException):
+            pending.extend(a for a in err.args if isinstance(a, BaseException))
+            pending.extend(c for c in (err.__cause__, err.__context__) if c is not None)
+    return False
 
 
 def _system_shutdown(app, reboot=False):
@@ -260,9 +390,9 @@ def _system_shutdown(app, reboot=False):
 
 
 def _system_shutdown_fallback(reboot):
-    command = ["sudo", "reboot"] if reboot else ["sudo", "shutdown", "-h", "now"]
+    command = [_SUDO, "reboot"] if reboot else [_SUDO, "shutdown", "-h", "now"]
     try:
-        subprocess.run(command, timeout=10, check=False)
+        subprocess.run(command, timeout=10, close_fds=False, check=False)
     except Exception as e:
         logger.warning("System %s command failed: %s", "reboot" if reboot else "shutdown", e)
 
@@ -271,8 +401,9 @@ def _restart_inkypi_service():
     service_name = os.environ.get("APPNAME", "inkypi")
     try:
         subprocess.run(
-            ["sudo", "systemctl", "restart", f"{service_name}.service"],
+            [_SUDO, "systemctl", "restart", f"{service_name}.service"],
             timeout=10,
+            close_fds=False,
             check=False,
         )
     except Exception as e:
@@ -12,12 +12,20 @@ Plugin Action Registration:
 """
 
 import os
+import functools
 import logging
 import subprocess
 
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, g
+from werkzeug.exceptions import BadRequest
 
-from .discovery import get_available_actions
+# Optional orjson: faster JSON parse/serialize for this blueprint's requests and responses
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from .discovery import NO_ACTION_ID, get_available_actions, get_available_actions_by_id
 from . import actions
 from . import button_manager
 
@@ -27,33 +35,166 @@ hardwarebuttons_bp = Blueprint("hardwarebuttons_api", __name__)
 
 # Stored refs for use from GPIO worker thread (set at registration or on first request)
 _core_refs = None
+# True once the server port has been read from a request (refs then need no more updates)
+_port_frozen = False
+
+# Sentinel for "not present" lookups (unknown action id, request body not parsed yet)
+_MISSING = object()
+
+# GPIO 2-27 typical for Pi, as a bitmask (bit n set -> pin n allowed)
+_ALLOWED_PIN_MASK = (1 << 28) - (1 << 2)
+
+# Button fields that must be a string (or missing/null) before they are stripped
+_STRING_FIELDS = (
+    "short_action",
+    "double_action",
+    "long_action",
+    "script_path_short",
+    "script_path_double",
+    "script_path_long",
+    "url_short",
+    "url_double",
+    "url_long",
+)
+
+# systemd unit restarted by /restart-service (read once; the environment doesn't change at runtime)
+_SERVICE_NAME = os.environ.get("APPNAME", "inkypi")
+
+# Upper bound for a save body; a full config of 26 buttons is a few KiB
+MAX_SAVE_BODY_BYTES = 64 * 1024
 
 DEFAULT_TIMINGS = {
     "short_press_ms": 500,
     "double_click_interval_ms": 500,
     "long_press_ms": 1000,
+    "reload_debounce_ms": 200,
 }
 
 
 def _parse_timing(value, default_value, min_value, max_value):
     """Parse timing value and clamp to safe bounds."""
+    if not isinstance(value, (int, float, str)):
+        # None, lists, objects: never parseable, and lists/dicts can't be cache keys
+        value = default_value
+    return _parse_timing_cached(value, default_value, min_value, max_value)
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_timing_cached(value, default_value, min_value, max_value):
+    # Pure function of its arguments; the UI sends the same few values every save
     try:
         parsed = int(value)
-    except (TypeError, ValueError):
+    except (TypeError, ValueError, OverflowError):
         parsed = default_value
     return max(min_value, min(max_value, parsed))
 
 
-def _normalize_action(action_id, available_action_ids):
-    """Validate and normalize an action id from UI payload."""
-    action_id = (action_id or "").strip()
-    if not action_id:
-        return None
-    if action_id == "external_script":
-        return action_id
-    if action_id in available_action_ids:
-        return action_id
-    raise ValueError(f"Unknown action_id: {action_id}")
+def _json_response(payload):
+    """jsonify() equivalent that serializes with orjson when it is installed."""
+    if orjson is None:
+        return jsonify(payload)
+    return current_app.response_class(orjson.dumps(payload), mimetype="application/json")
+
+
+def _request_json():
+    """Return the parsed JSON request body, parsing it at most once per request (stored on g)."""
+    payload = g.get("hardwarebuttons_payload", _MISSING)
+    if payload is _MISSING:
+        payload = g.hardwarebuttons_payload = _parse_request_json()
+    return payload
+
+
+def _parse_request_json():
+    """Parse the JSON request body, with orjson when it is installed (same errors as get_json())."""
+    if orjson is None or not request.is_json:
+        return request.get_json()
+    # Body is parsed once per request; don't keep a second copy of the raw bytes on the request
+    data = request.get_data(cache=False)
+    if not data:
+        raise BadRequest("Failed to decode JSON object: empty body")
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError as e:
+        raise BadRequest(f"Failed to decode JSON object: {e}")
+
+
+def _clean_string(value):
+    """Strip a string field from the UI payload; empty or missing -> None."""
+    return (value or "").strip() or None
+
+
+def _payload_shape_error(data):
+    """Check the top-level structure of a save payload; return an error message or None."""
+    if not isinstance(data, dict):
+        return "payload must be an object"
+    if not isinstance(data.get("timings") or {}, dict):
+        return "timings must be an object"
+    if not isinstance(data.get("buttons") or [], list):
+        return "buttons must be a list"
+    return None
+
+
+def _normalize_button(i, btn, valid_ids, used_pins, validation_errors):
+    """Validate one button entry from the save payload.
+
+    used_pins is the bitmask of pins claimed by earlier entries. Appends problems to
+    validation_errors. Returns (button, bit): the normalized button dict (None if the
+    entry must be skipped) and the bit of the pin this entry claims (0 if none).
+    """
+    if not isinstance(btn, dict):
+        validation_errors.append(f"buttons[{i}] must be an object")
+        return None, 0
+    get = btn.get
+    clean = _clean_string
+    try:
+        pin = int(get("gpio_pin"))
+    except (TypeError, ValueError):
+        validation_errors.append(f"buttons[{i}].gpio_pin must be an integer")
+        return None, 0
+    # Pin's bit if it is an allowed pin, else 0 (range checked first so 1 << pin stays small)
+    bit = (1 << pin) & _ALLOWED_PIN_MASK if 0 <= pin < 32 else 0
+    if not bit:
+        validation_errors.append(f"buttons[{i}].gpio_pin must be between 2 and 27")
+        return None, 0
+    if used_pins & bit:
+        validation_errors.append(f"Duplicate GPIO pin configured: {pin}")
+        return None, 0
+    for field in _STRING_FIELDS:
+        value = get(field)
+        if value is not None and not isinstance(value, str):
+            validation_errors.append(f"buttons[{i}].{field} must be a string")
+            return None, bit
+    # valid_ids maps every accepted id to its normalized value ("" -> None)
+    short_raw = (get("short_action") or "").strip()
+    double_raw = (get("double_action") or "").strip()
+    long_raw = (get("long_action") or "").strip()
+    short_a = valid_ids.get(short_raw, _MISSING)
+    double_a = valid_ids.get(double_raw, _MISSING)
+    long_a = valid_ids.get(long_raw, _MISSING)
+    for raw, action_id in ((short_raw, short_a), (double_raw, double_a), (long_raw, long_a)):
+        if action_id is _MISSING:
+            validation_errors.append(f"buttons[{i}]: Unknown action_id: {raw}")
+            return None, bit
+    url_short = clean(get("url_short")) if short_a == "call_url" else None
+    url_double = clean(get("url_double")) if double_a == "call_url" else None
+    url_long = clean(get("url_long")) if long_a == "call_url" else None
+    # Validate URLs if provided
+    for url_val, action_name in ((url_short, "short"), (url_double, "double"), (url_long, "long")):
+        if url_val and not (url_val.startswith("http://") or url_val.startswith("https://")):
+            validation_errors.append(f"buttons[{i}].url_{action_name} must start with http:// or https://")
+    return {
+        "id": get("id") or f"btn_{i}",
+        "gpio_pin": pin,
+        "short_action": short_a,
+        "double_action": double_a,
+        "long_action": long_a,
+        "script_path_short": clean(get("script_path_short")) if short_a == "external_script" else None,
+        "script_path_double": clean(get("script_path_double")) if double_a == "external_script" else None,
+        "script_path_long": clean(get("script_path_long")) if long_a == "external_script" else None,
+        "url_short": url_short,
+        "url_double": url_double,
+        "url_long": url_long,
+    }, bit
 
 
 @hardwarebuttons_bp.record_once
@@ -77,13 +218,16 @@ def _on_blueprint_registered(state):
 
 
 def _capture_refs():
-    global _core_refs
+    global _core_refs, _port_frozen
     if _core_refs is not None:
-        # Update port from request when available (e.g. dev mode uses 8080)
+        if _port_frozen:
+            return _core_refs
+        # Update port from the first request (e.g. dev mode uses 8080); it never changes afterwards
         if request:
             try:
                 port = request.environ.get("SERVER_PORT", "80")
                 _core_refs["port"] = int(port)
+                _port_frozen = True
             except (TypeError, ValueError):
                 pass
         logger.debug("_capture_refs(): using existing refs (port=%s)", _core_refs.get("port"))
@@ -104,6 +248,7 @@ def _capture_refs():
             "app": current_app._get_current_object(),
             "port": port,
         }
+        _port_frozen = bool(request)
         logger.debug("_capture_refs(): first request -> stored refs (port=%s), starting button manager", port)
         button_manager.start_if_needed(_core_refs)
         return _core_refs
@@ -114,6 +259,8 @@ def _capture_refs():
 
 @hardwarebuttons_bp.before_request
 def _ensure_refs():
+    if _port_frozen and _core_refs is not None:
+        return
     try:
         _capture_refs()
     except Exception:
@@ -127,11 +274,21 @@ def save():
     refs = _capture_refs()
     if not refs:
         logger.debug("save: no refs -> 500")
-        return jsonify({"success": False, "error": "Not in request context"}), 500
+        return _json_response({"success": False, "error": "Not in request context"}), 500
     device_config = refs["device_config"]
-    data = request.get_json() or {}
+    if (request.content_length or 0) > MAX_SAVE_BODY_BYTES:
+        logger.warning("save: payload too large (%s bytes)", request.content_length)
+        return _json_response({"success": False, "error": "Payload too large"}), 413
+    data = _request_json() or {}
+    # Reject a malformed payload shape up front, before any per-field work
+    shape_error = _payload_shape_error(data)
+    if shape_error:
+        logger.warning("save: invalid payload: %s", shape_error)
+        return _json_response({"success": False, "error": "Validation failed", "details": [shape_error]}), 400
     timings = data.get("timings") or {}
     buttons = data.get("buttons") or []
+    stored = device_config.get_config("hardwarebuttons", default={}) or {}
+    stored_timings = stored.get("timings") or {}
 
     timings = {
         "short_press_ms": _parse_timing(
@@ -152,80 +309,44 @@ def save():
             200,
             5000,
         ),
+        # Not on the settings form: keep the stored value unless the payload sets one
+        "reload_debounce_ms": _parse_timing(
+            timings.get("reload_debounce_ms", stored_timings.get("reload_debounce_ms")),
+            DEFAULT_TIMINGS["reload_debounce_ms"],
+            0,
+            2000,
+        ),
     }
 
     # Validate buttons
-    allowed_pins = set(range(2, 28))  # GPIO 2-27 typical for Pi
-    validated_buttons = []
     validation_errors = []
-    used_pins = set()
-    available = {a["id"] for a in get_available_actions(device_config)}
+    used_pins = 0  # bitmask of claimed pins
+    # Built-ins are always bindable, even if discovery output changes.
+    # Maps each accepted action id to itself; an empty slot means "no action".
+    valid_ids = {aid: aid for aid in actions.BUILTIN_ACTION_IDS | get_available_actions_by_id(device_config).keys()}
+    valid_ids[NO_ACTION_ID] = None
+    validated_buttons = []
     for i, btn in enumerate(buttons):
-        if not isinstance(btn, dict):
-            validation_errors.append(f"buttons[{i}] must be an object")
-            continue
-        pin = btn.get("gpio_pin")
-        try:
-            pin = int(pin)
-        except (TypeError, ValueError):
-            validation_errors.append(f"buttons[{i}].gpio_pin must be an integer")
-            continue
-        if pin not in allowed_pins:
-            validation_errors.append(f"buttons[{i}].gpio_pin must be between 2 and 27")
-            continue
-        if pin in used_pins:
-            validation_errors.append(f"Duplicate GPIO pin configured: {pin}")
-            continue
-        used_pins.add(pin)
-        bid = btn.get("id") or f"btn_{i}"
-        try:
-            short_a = _normalize_action(btn.get("short_action"), available)
-            double_a = _normalize_action(btn.get("double_action"), available)
-            long_a = _normalize_action(btn.get("long_action"), available)
-        except ValueError as e:
-            validation_errors.append(f"buttons[{i}]: {e}")
-            continue
-        script_short = ((btn.get("script_path_short") or "").strip() or None) if short_a == "external_script" else None
-        script_double = ((btn.get("script_path_double") or "").strip() or None) if double_a == "external_script" else None
-        script_long = ((btn.get("script_path_long") or "").strip() or None) if long_a == "external_script" else None
-        url_short_raw = (btn.get("url_short") or "").strip() or None
-        url_double_raw = (btn.get("url_double") or "").strip() or None
-        url_long_raw = (btn.get("url_long") or "").strip() or None
-        url_short = url_short_raw if short_a == "call_url" else None
-        url_double = url_double_raw if double_a == "call_url" else None
-        url_long = url_long_raw if long_a == "call_url" else None
-        # Validate URLs if provided
-        for url_val, action_type, action_name in [
-            (url_short, short_a, "short"),
-            (url_double, double_a, "double"),
-            (url_long, long_a, "long")
-        ]:
-            if url_val and action_type == "call_url":
-                if not (url_val.startswith("http://") or url_val.startswith("https://")):
-                    validation_errors.append(f"buttons[{i}].url_{action_name} must start with http:// or https://")
-        validated_buttons.append({
-            "id": bid,
-            "gpio_pin": pin,
-            "short_action": short_a,
-            "double_action": double_a,
-            "long_action": long_a,
-            "script_path_short": script_short,
-            "script_path_double": script_double,
-            "script_path_long": script_long,
-            "url_short": url_short,
-            "url_double": url_double,
-            "url_long": url_long,
-        })
+        button, bit = _normalize_button(i, btn, valid_ids, used_pins, validation_errors)
+        used_pins |= bit
+        if button is not None:
+            validated_buttons.append(button)
 
     if validation_errors:
         logger.warning("save: validation failed: %s", validation_errors)
-        return jsonify({"success": False, "error": "Validation failed", "details": validation_errors}), 400
+        return _json_response({"success": False, "error": "Validation failed", "details": validation_errors}), 400
 
     payload = {"timings": timings, "buttons": validated_buttons}
+    # Idempotent save: skip the config write, but still reload so pins that failed to
+    # open are retried (the manager keeps buttons whose config is unchanged)
+    if stored == payload:
+        logger.debug("save: config unchanged, skipping write; requesting button manager reload")
+        button_manager.request_reload()
+        return _json_response({"success": True, "unchanged": True})
     device_config.update_value("hardwarebuttons", payload, write=True)
     logger.debug("save: wrote %d buttons, timings %s; requesting button manager reload", len(validated_buttons), timings)
     button_manager.request_reload()
-    return jsonify({"success": True})
+    return _json_response({"success": True})
 
 
 @hardwarebuttons_bp.route("/hardwarebuttons-api/available-actions", methods=["GET"])
@@ -234,10 +355,10 @@ def available_actions():
     logger.debug("GET /hardwarebuttons-api/available-actions called")
     refs = _capture_refs()
     if not refs:
-        return jsonify({"success": False, "actions": []}), 500
+        return _json_response({"success": False, "actions": []}), 500
     actions_list = get_available_actions(refs["device_config"])
     logger.debug("available-actions: returning %d actions", len(actions_list))
-    return jsonify({"success": True, "actions": actions_list})
+    return _json_response({"success": True, "actions": actions_list})
 
 
 @hardwarebuttons_bp.route("/hardwarebuttons-api/execute", methods=["POST"])
@@ -246,20 +367,21 @@ def execute():
     logger.debug("POST /hardwarebuttons-api/execute called")
     refs = _capture_refs()
     if not refs:
-        return jsonify({"success": False, "error": "Not in request context"}), 500
-    data = request.get_json() or {}
+        return _json_response({"success": False, "error": "Not in request context"}), 500
+    data = _request_json() or {}
     action_id = (data.get("action_id") or "").strip()
     if not action_id:
-        return jsonify({"success": False, "error": "action_id required"}), 400
+        return _json_response({"success": False, "error": "action_id required"}), 400
     context = data.get("context") or {}
-    logger.debug("execute: action_id=%s, context keys=%s", action_id, list(context.keys()))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("execute: action_id=%s, context keys=%s", action_id, list(context.keys()))
     try:
         actions.execute_action(refs, action_id, context)
         logger.debug("execute: action %s completed", action_id)
-        return jsonify({"success": True})
+        return _json_response({"success": True})
     except Exception as e:
         logger.exception("execute_action failed")
-        return jsonify({"success": False, "error": str(e)}), 500
+        return _json_response({"success": False, "error": str(e)}), 500
 
 
 @hardwarebuttons_bp.route("/hardwarebuttons-api/restart-service", methods=["POST"])
@@ -267,17 +389,19 @@ def restart_service():
     """Restart InkyPi service (used by system_restart_inkypi action)."""
     logger.debug("POST /hardwarebuttons-api/restart-service called")
     try:
-        service_name = os.environ.get("APPNAME", "inkypi")
-        logger.debug("restart-service: running systemctl restart %s.service", service_name)
-        subprocess.run(
-            ["sudo", "systemctl", "restart", f"{service_name}.service"],
-            timeout=10,
-            check=False,
+        logger.debug("restart-service: running systemctl restart %s.service", _SERVICE_NAME)
+        # Fire and forget: the restart stops this process anyway, so don't hold the request open
+        subprocess.Popen(
+            ["sudo", "systemctl", "restart", f"{_SERVICE_NAME}.service"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
         )
-        return jsonify({"success": True})
+        return _json_response({"success": True})
     except Exception as e:
         logger.warning("Restart service failed: %s", e)
-        return jsonify({"success": False, "error": str(e)}), 500
+        return _json_response({"success": False, "error": str(e)}), 500
 
 
 def get_core_refs():
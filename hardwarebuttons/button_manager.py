@@ -1,6 +1,9 @@
 """GPIO button manager: sets up gpiozero buttons and runs short/double/long press state machine."""
 
+import heapq
+import json
 import logging
+import queue
 import threading
 import time
 
@@ -11,10 +14,121 @@ logger = logging.getLogger(__name__)
 _refs = None
 _thread = None
 _buttons = []  # list of (Button, bindings_dict) for cleanup
-_lock = threading.Lock()
+_lock = threading.Lock()  # guards manager thread start in start_if_needed
 _reload_event = threading.Event()
+_refs_event = threading.Event()  # set by start_if_needed whenever _refs is (re)assigned
 _active_generation = 0
 _timers = set()
+# refs and config key the current _buttons were built from (see _rebuild_buttons)
+_setup_refs = None
+_setup_key = None
+
+
+class _DelayedCall:
+    """A callback scheduled on _scheduler; cancel() is safe from any thread."""
+
+    __slots__ = ("deadline", "callback", "cancelled")
+
+    def __init__(self, deadline, callback):
+        self.deadline = deadline
+        self.callback = callback
+        self.cancelled = False
+
+    def __lt__(self, other):
+        return self.deadline < other.deadline
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class _Scheduler:
+    """One daemon thread running delayed callbacks in deadline order.
+
+    Replaces a threading.Timer (one OS thread) per short press. Callbacks run on
+    the scheduler thread, so they must return quickly and hand any real work (button
+    actions) to _action_worker; it sleeps until the next deadline and not at all when idle.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._heap = []
+        self._thread = None
+
+    def call_later(self, delay, callback):
+        call = _DelayedCall(time.monotonic() + delay, callback)
+        with self._cond:
+            heapq.heappush(self._heap, call)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="hardwarebuttons-timers", daemon=True)
+                self._thread.start()
+            elif self._heap[0] is call:
+                # New earliest deadline: wake the thread to shorten its sleep
+                self._cond.notify()
+        return call
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    while self._heap and self._heap[0].cancelled:
+                        heapq.heappop(self._heap)
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    delay = self._heap[0].deadline - time.monotonic()
+                    if delay <= 0:
+                        call = heapq.heappop(self._heap)
+                        break
+                    self._cond.wait(delay)
+            try:
+                call.callback()
+            except Exception as e:
+                logger.warning("Scheduled button callback failed: %s", e)
+
+
+_scheduler = _Scheduler()
+
+
+class _ActionWorker:
+    """One long-lived daemon thread running short-press actions off the scheduler thread.
+
+    Holds at most one action, queued or running: a press submitted while the worker
+    is busy is dropped, matching the busy gate in actions, instead of queueing up.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue(maxsize=1)
+        self._idle = threading.Lock()  # held from submit() until the action finishes
+        self._start_lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, func, arg):
+        """Hand func(arg) to the worker; returns False (press dropped) if it is busy."""
+        if not self._idle.acquire(blocking=False):
+            return False
+        try:
+            self._queue.put_nowait((func, arg))
+        except queue.Full:
+            self._idle.release()
+            return False
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="hardwarebuttons-actions", daemon=True)
+                self._thread.start()
+        return True
+
+    def _run(self):
+        while True:
+            func, arg = self._queue.get()
+            try:
+                func(arg)
+            except Exception as e:
+                logger.warning("Button action worker failed: %s", e)
+            finally:
+                self._idle.release()
+
+
+_action_worker = _ActionWorker()
 
 # Optional gpiozero; missing on non-Pi / dev
 try:
@@ -28,9 +142,11 @@ except ImportError:
 def start_if_needed(refs):
     """Start the button manager thread if we have refs and GPIO; store refs for worker."""
     global _refs, _thread
-    logger.debug("start_if_needed called (thread_alive=%s)", _thread.is_alive() if _thread and _thread.is_alive() else False)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("start_if_needed called (thread_alive=%s)", bool(_thread and _thread.is_alive()))
     with _lock:
         _refs = refs
+        _refs_event.set()
         if _thread is None or not _thread.is_alive():
             _thread = threading.Thread(target=_run, daemon=True)
             _thread.start()
@@ -50,61 +166,84 @@ def _run():
     """Background loop: setup buttons from config, then wait for reload or exit."""
     logger.debug("_run: button manager loop started")
     while True:
-        with _lock:
-            refs = _refs
+        # Clear before reading refs so a start_if_needed() racing with us still wakes the wait
+        _refs_event.clear()
+        refs = _refs  # single global read; start_if_needed rebinds it atomically
         if not refs:
-            logger.debug("_run: no refs yet -> sleep 2s")
-            time.sleep(2)
+            logger.debug("_run: no refs yet -> wait for start_if_needed")
+            _refs_event.wait()
             continue
         device_config = refs.get("device_config")
         if not device_config:
-            logger.debug("_run: no device_config -> sleep 2s")
-            time.sleep(2)
+            logger.debug("_run: no device_config -> wait for new refs")
+            _refs_event.wait()
             continue
+        # Clear the reload flag before reading the config: a save that lands while we
+        # rebuild sets it again and triggers another pass
+        _reload_event.clear()
         cfg = device_config.get_config("hardwarebuttons", default={}) or {}
         timings = cfg.get("timings") or {}
         short_ms = int(timings.get("short_press_ms", 500))
         double_ms = int(timings.get("double_click_interval_ms", 500))
         long_ms = int(timings.get("long_press_ms", 1000))
+        reload_debounce_ms = int(timings.get("reload_debounce_ms", 200))
         buttons_cfg = cfg.get("buttons") or []
         logger.debug("_run: loaded config: %d buttons, timings short=%s double=%s long=%s ms", len(buttons_cfg), short_ms, double_ms, long_ms)
 
-        _close_buttons()
-        global _active_generation
-        with _lock:
-            _active_generation += 1
-        _reload_event.clear()
-
-        if not GPIOZERO_AVAILABLE or not Button:
-            logger.debug("gpiozero not available, hardware buttons disabled")
-            while not _reload_event.wait(timeout=1):
-                pass
-            continue
-
-        for bindings in buttons_cfg:
-            pin = bindings.get("gpio_pin")
-            if pin is None:
-                continue
-            try:
-                btn = Button(pin, hold_time=long_ms / 1000.0)
-                _setup_button(btn, bindings, refs, short_ms, double_ms, _active_generation)
-                _buttons.append((btn, bindings))
-                logger.debug("_run: setup button GPIO %s (id=%s)", pin, bindings.get("id"))
-            except Exception as e:
-                logger.warning("Could not setup button on GPIO %s: %s", pin, e)
+        # Everything the current buttons were built from; serialized so in-place edits show up
+        setup_key = json.dumps([buttons_cfg, short_ms, double_ms, long_ms], sort_keys=True, default=str)
+        if refs is _setup_refs and setup_key == _setup_key:
+            logger.debug("_run: button config unchanged -> keeping %d button(s)", len(_buttons))
+        else:
+            _rebuild_buttons(refs, buttons_cfg, short_ms, double_ms, long_ms, setup_key)
 
         logger.debug("_run: %d buttons active, waiting for reload or trigger", len(_buttons))
-        while not _reload_event.wait(timeout=0.5):
-            pass
+        # Sleep until request_reload(); buttons are serviced by gpiozero's own threads
+        _reload_event.wait()
         logger.info("Hardware buttons reload requested")
+        # Debounce: reloads requested during this pause are absorbed into one rebuild
+        if reload_debounce_ms > 0:
+            time.sleep(reload_debounce_ms / 1000.0)
+
+
+def _rebuild_buttons(refs, buttons_cfg, short_ms, double_ms, long_ms, setup_key):
+    """Close the current buttons and set up new ones from buttons_cfg."""
+    global _active_generation, _setup_refs, _setup_key
+    _active_generation += 1  # retire old callbacks; this thread is the only writer
+    _close_buttons()
+    _setup_refs = _setup_key = None
+
+    if not GPIOZERO_AVAILABLE or not Button:
+        logger.debug("gpiozero not available, hardware buttons disabled")
+        return
+
+    failed = False
+    for bindings in buttons_cfg:
+        pin = bindings.get("gpio_pin")
+        if pin is None:
+            continue
+        try:
+            btn = Button(pin, hold_time=long_ms / 1000.0)
+            _setup_button(btn, bindings, refs, short_ms, double_ms, _active_generation)
+            _buttons.append((btn, bindings))
+            logger.debug("_rebuild_buttons: setup button GPIO %s (id=%s)", pin, bindings.get("id"))
+        except Exception as e:
+            failed = True
+            logger.warning("Could not setup button on GPIO %s: %s", pin, e)
+    if not failed:
+        # Only a complete setup may be skipped next time; failed pins are retried on reload
+        _setup_refs, _setup_key = refs, setup_key
 
 
 def _close_buttons():
-    global _buttons
-    with _lock:
-        timers = list(_timers)
-        _timers.clear()
-    for timer in timers:
+    global _buttons, _timers
+    # Swap in a fresh set (one atomic rebind); a timer registered concurrently is
+    # still ignored when it fires because the generation has moved on. Callbacks that
+    # grabbed the old set can still add/discard on it, so iterate over a snapshot:
+    # list(set) copies in one step under the GIL, while a live iteration would raise
+    # "Set changed size during iteration" and kill the manager thread.
+    timers, _timers = _timers, set()
+    for timer in list(timers):
         try:
             timer.cancel()
         except Exception:
@@ -119,109 +258,138 @@ def _close_buttons():
     _buttons = []
 
 
+# set.add/discard are single atomic operations under the GIL; no lock needed
 def _register_timer(timer):
-    with _lock:
-        _timers.add(timer)
+    _timers.add(timer)
 
 
 def _discard_timer(timer):
-    with _lock:
-        _timers.discard(timer)
+    _timers.discard(timer)
 
 
 def _is_generation_active(generation):
-    with _lock:
-        return generation == _active_generation and not _reload_event.is_set()
+    # Lock-free: _active_generation is an int rebound only by the _run thread
+    return generation == _active_generation and not _reload_event.is_set()
+
+
+class _BtnState:
+    """Mutable press state shared by one button's callbacks."""
+
+    __slots__ = ("pending", "long_fired", "pressed_at")
+
+    def __init__(self):
+        self.pending = None  # _DelayedCall for the open double-click window, if any
+        self.long_fired = False
+        self.pressed_at = None  # time.monotonic() of the current press
+
+
+def _resolve_slot(refs, bindings, slot):
+    """Resolve the action bound to slot ("short" | "double" | "long").
+
+    Returns (action_id, callable) or None when the slot has no action.
+    """
+    action_id = bindings.get(f"{slot}_action")
+    if not action_id:
+        return None
+    ctx = {}
+    script_path = bindings.get(f"script_path_{slot}")
+    if script_path:
+        ctx["script_path"] = script_path
+    url = bindings.get(f"url_{slot}")
+    if url:
+        ctx["url"] = url
+    call = actions.resolve(refs, action_id, ctx if ctx else None)
+    if call is None:
+        return None  # e.g. "none": no-op slot, like execute_action()
+    return action_id, call
 
 
 def _setup_button(btn, bindings, refs, short_ms, double_ms, generation):
     """Attach callbacks for short, double, long to a gpiozero Button."""
-    pending_short_timer = [None]  # use list so closure can mutate
-    long_fired = [False]
-    press_started_monotonic = [None]
+    st = _BtnState()
+    # Bindings are fixed for this generation: resolve each slot's action once at setup
+    # (a reload runs _setup_button again) instead of on every press
+    gpio_pin = bindings.get("gpio_pin")
+    short_call = _resolve_slot(refs, bindings, "short")
+    double_call = _resolve_slot(refs, bindings, "double")
+    long_call = _resolve_slot(refs, bindings, "long")
 
-    def run_action(action_id, script_path=None, url=None):
+    def run_action(resolved):
         if not _is_generation_active(generation):
-            logger.debug("run_action: stale callback ignored for GPIO %s", bindings.get("gpio_pin"))
+            logger.debug("run_action: stale callback ignored for GPIO %s", gpio_pin)
             return
-        logger.debug("run_action: action_id=%s (from GPIO %s)", action_id, bindings.get("gpio_pin"))
-        ctx = {}
-        if script_path:
-            ctx["script_path"] = script_path
-        if url:
-            ctx["url"] = url
+        action_id, call = resolved
+        logger.debug("run_action: action_id=%s (from GPIO %s)", action_id, gpio_pin)
         try:
-            actions.execute_action(refs, action_id, ctx if ctx else None)
+            call()
         except Exception as e:
             logger.warning("Button action %s failed: %s", action_id, e)
 
     def on_pressed():
-        press_started_monotonic[0] = time.monotonic()
+        st.pressed_at = time.monotonic()
 
     def on_held():
-        logger.debug("on_held: long press detected on GPIO %s -> firing long_action", bindings.get("gpio_pin"))
-        long_fired[0] = True
-        if pending_short_timer[0]:
-            pending_short_timer[0].cancel()
-            _discard_timer(pending_short_timer[0])
-            pending_short_timer[0] = None
-        action = bindings.get("long_action")
-        if action:
-            run_action(action, bindings.get("script_path_long"), bindings.get("url_long"))
+        logger.debug("on_held: long press detected on GPIO %s -> firing long_action", gpio_pin)
+        st.long_fired = True
+        if st.pending:
+            st.pending.cancel()
+            _discard_timer(st.pending)
+            st.pending = None
+        if long_call:
+            run_action(long_call)
+
+    # Defined once per button (not per press); fires when the double-click window expires
+    def fire_short():
+        if st.pending:
+            _discard_timer(st.pending)
+        st.pending = None
+        if not _is_generation_active(generation):
+            logger.debug("fire_short: stale timer ignored for GPIO %s", gpio_pin)
+            return
+        logger.debug("fire_short: single short press on GPIO %s -> firing short_action", gpio_pin)
+        # Run off the scheduler thread so a slow action never delays other buttons' timeouts
+        if short_call and not _action_worker.submit(run_action, short_call):
+            logger.debug("fire_short: action worker busy, ignoring short press on GPIO %s", gpio_pin)
 
     def on_released():
-        if long_fired[0]:
-            long_fired[0] = False
-            press_started_monotonic[0] = None
+        if st.long_fired:
+            st.long_fired = False
+            st.pressed_at = None
             return
-        if press_started_monotonic[0] is None:
+        if st.pressed_at is None:
             press_ms = 0
         else:
-            press_ms = int((time.monotonic() - press_started_monotonic[0]) * 1000)
-        press_started_monotonic[0] = None
-        if pending_short_timer[0]:
+            press_ms = int((time.monotonic() - st.pressed_at) * 1000)
+        st.pressed_at = None
+        if st.pending:
             if press_ms > short_ms:
                 logger.debug(
                     "on_released: second press too long (%sms > %sms) on GPIO %s -> keep pending short",
                     press_ms,
                     short_ms,
-                    bindings.get("gpio_pin"),
+                    gpio_pin,
                 )
                 return
-            pending_short_timer[0].cancel()
-            _discard_timer(pending_short_timer[0])
-            pending_short_timer[0] = None
+            st.pending.cancel()
+            _discard_timer(st.pending)
+            st.pending = None
             # Second release within double window -> double click
-            logger.debug("on_released: second press in window on GPIO %s -> firing double_action", bindings.get("gpio_pin"))
-            action = bindings.get("double_action")
-            if action:
-                run_action(action, bindings.get("script_path_double"), bindings.get("url_double"))
+            logger.debug("on_released: second press in window on GPIO %s -> firing double_action", gpio_pin)
+            if double_call:
+                run_action(double_call)
             return
         if press_ms > short_ms:
             logger.debug(
                 "on_released: press longer than short threshold (%sms > %sms) on GPIO %s -> no short/double action",
                 press_ms,
                 short_ms,
-                bindings.get("gpio_pin"),
+                gpio_pin,
             )
             return
         # First release: start double-click window
-        def fire_short():
-            if pending_short_timer[0]:
-                _discard_timer(pending_short_timer[0])
-            pending_short_timer[0] = None
-            if not _is_generation_active(generation):
-                logger.debug("fire_short: stale timer ignored for GPIO %s", bindings.get("gpio_pin"))
-                return
-            logger.debug("fire_short: single short press on GPIO %s -> firing short_action", bindings.get("gpio_pin"))
-            action = bindings.get("short_action")
-            if action:
-                run_action(action, bindings.get("script_path_short"), bindings.get("url_short"))
-
-        t = threading.Timer(double_ms / 1000.0, fire_short)
-        pending_short_timer[0] = t
+        t = _scheduler.call_later(double_ms / 1000.0, fire_short)
+        st.pending = t
         _register_timer(t)
-        t.start()
 
     btn.when_pressed = on_pressed
     btn.when_held = on_held
@@ -25,6 +25,16 @@ BUILTIN_ACTIONS = [
 ]
 # No-action option for dropdowns
 NO_ACTION_ID = ""
+_NO_ACTION = {"id": NO_ACTION_ID, "label": "(No action)", "group": "Core"}
+# Built-in entries as shared dicts (callers treat action dicts as read-only)
+_BUILTIN_CACHED = tuple(dict(a) for a in BUILTIN_ACTIONS)
+# "Display Action N" entries, grown on demand and sliced to the registered maximum
+_display_cache = []
+
+# (registry_version, actions tuple) built by get_available_actions()
+_actions_cache = (None, ())
+# (registry_version, {action_id: action}) built by get_available_actions_by_id()
+_by_id_cache = (None, {})
 
 
 def get_available_actions(device_config):
@@ -44,18 +54,20 @@ def get_available_actions(device_config):
     Args:
         device_config: Config instance (unused; kept for backward compatibility with callers).
 
+    The list is built once per action_registry.get_registry_version() and cached; each
+    call returns a new list, but the action dicts in it are shared and must not be mutated.
+
     Returns:
         List of dicts: id, label, group ("Core" | "System" | "Current Plugin" | "Other Plugins").
     """
-    logger.debug("get_available_actions called")
-    out = []
-    
-    # No-action first
-    out.append({"id": NO_ACTION_ID, "label": "(No action)", "group": "Core"})
-
-    # Built-in Core/System actions
-    for a in BUILTIN_ACTIONS:
-        out.append(dict(a))
+    global _actions_cache, _display_cache
+    version = action_registry.get_registry_version()
+    cached_version, cached = _actions_cache
+    if cached_version == version:
+        return list(cached)
+    logger.debug("get_available_actions: building action list (registry version %s)", version)
+    # No-action first, then built-in Core/System actions
+    out = [_NO_ACTION, *_BUILTIN_CACHED]
     logger.debug("get_available_actions: added %d built-in actions", len(BUILTIN_ACTIONS))
     
     # Plugin-registered anytime actions
@@ -65,13 +77,41 @@ def get_available_actions(device_config):
     
     # Generic display actions (based on max registered)
     max_display = action_registry.get_max_display_action_count()
-    for i in range(max_display):
-        out.append({
-            "id": f"display_action_{i}",
-            "label": f"Display Action {i + 1}",
-            "group": "Current Plugin",
-        })
+    display_entries = _display_cache
+    if len(display_entries) < max_display:
+        # Rebind rather than append so concurrent builds can't interleave entries
+        display_entries = _display_cache = display_entries + [
+            {
+                "id": f"display_action_{i}",
+                "label": f"Display Action {i + 1}",
+                "group": "Current Plugin",
+            }
+            for i in range(len(display_entries), max_display)
+        ]
+    out.extend(display_entries[:max_display])
     logger.debug("get_available_actions: added %d generic display actions", max_display)
     
     logger.debug("get_available_actions: total %d actions", len(out))
+    _actions_cache = (version, tuple(out))
     return out
+
+
+def get_available_actions_by_id(device_config):
+    """Return available actions indexed by id, rebuilt only when the registry changes.
+
+    The action list depends only on built-ins and the action registry, so the index
+    is keyed on action_registry.get_registry_version(). Treat the result as read-only.
+
+    Args:
+        device_config: Config instance (passed through to get_available_actions).
+
+    Returns:
+        Dict: action_id -> action dict (same entries as get_available_actions()).
+    """
+    global _by_id_cache
+    version = action_registry.get_registry_version()
+    cached_version, by_id = _by_id_cache
+    if cached_version != version:
+        by_id = {a["id"]: a for a in get_available_actions(device_config)}
+        _by_id_cache = (version, by_id)
+    return by_id
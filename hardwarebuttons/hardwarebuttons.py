@@ -2,16 +2,27 @@
 
 from plugins.base_plugin.base_plugin import BasePlugin
 from PIL import Image
+from flask import current_app
 import logging
 import os
 import subprocess
+import threading
+
+from . import api
+from .discovery import get_available_actions
+from .patch_core import check_core_patched
 
 logger = logging.getLogger(__name__)
 
+# Held (never released) once patch-core.sh has been launched, so page renders don't
+# start it again; a non-blocking acquire is an atomic test-and-set across request threads
+_patch_started = threading.Lock()
+
 DEFAULT_TIMINGS = {
     "short_press_ms": 500,
     "double_click_interval_ms": 500,
     "long_press_ms": 1000,
+    "reload_debounce_ms": 200,
 }
 
 
@@ -22,7 +33,6 @@ class HardwareButtons(BasePlugin):
     def get_blueprint(cls):
         """Return the Flask blueprint for this plugin's API routes."""
         logger.debug("get_blueprint() called -> returning hardwarebuttons_bp")
-        from . import api
         return api.hardwarebuttons_bp
 
     def generate_settings_template(self):
@@ -30,13 +40,10 @@ class HardwareButtons(BasePlugin):
         logger.debug("generate_settings_template() called (building settings page data)")
         template_params = super().generate_settings_template()
         try:
-            from flask import current_app
-
             # Check if core files need patching first
             core_needs_patch = False
             core_patch_missing = []
             try:
-                from .patch_core import check_core_patched
                 is_patched, missing = check_core_patched()
                 core_needs_patch = not is_patched
                 core_patch_missing = missing
@@ -50,7 +57,11 @@ class HardwareButtons(BasePlugin):
             if core_needs_patch:
                 logger.debug("core needs patch -> skipping config load, starting autopatch if script present")
                 patch_script = os.path.join(os.path.dirname(__file__), "patch-core.sh")
-                if os.path.isfile(patch_script):
+                if not _patch_started.acquire(blocking=False):
+                    # Already running (it restarts the service when done); don't fork another
+                    logger.debug("autopatch already started in this process")
+                    template_params['auto_patch_started'] = True
+                elif os.path.isfile(patch_script):
                     try:
                         subprocess.Popen(
                             ["bash", patch_script],
@@ -59,9 +70,11 @@ class HardwareButtons(BasePlugin):
                         )
                         template_params['auto_patch_started'] = True
                     except Exception as e:
+                        _patch_started.release()
                         logger.warning(f"Could not start auto core patch: {e}")
                         template_params['auto_patch_started'] = False
                 else:
+                    _patch_started.release()
                     logger.warning("patch-core.sh not found for hardwarebuttons")
                     template_params['auto_patch_started'] = False
                 template_params['timings'] = DEFAULT_TIMINGS
@@ -74,7 +87,6 @@ class HardwareButtons(BasePlugin):
                     hw_cfg = device_config.get_config("hardwarebuttons", default={}) or {}
                     template_params['timings'] = {**DEFAULT_TIMINGS, **(hw_cfg.get("timings") or {})}
                     template_params['buttons'] = hw_cfg.get("buttons") or []
-                    from .discovery import get_available_actions
                     template_params['available_actions'] = get_available_actions(device_config)
                     logger.debug("loaded config: %d buttons, %d available_actions", len(template_params['buttons']), len(template_params['available_actions']))
                 else:
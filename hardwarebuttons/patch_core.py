@@ -1,7 +1,6 @@
 """Core patching functionality for hardwarebuttons plugin (same patch as pluginmanager)."""
 
 import os
-import re
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,6 +15,59 @@ def _project_dir():
         return os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 
+# path -> (st_mtime_ns, st_size, content); shared by check_core_patched and patch_core_files
+_file_cache = {}
+
+
+def _read_bytes(path):
+    """Read a file as raw bytes (the core sources are ASCII; no decode needed).
+
+    Returns:
+        tuple: (content: bytes, stat: os.stat_result), or (None, None) if it can't be read
+    """
+    try:
+        with open(path, 'rb') as f:
+            return f.read(), os.fstat(f.fileno())
+    except OSError:
+        return None, None
+
+
+def _load(path):
+    """Return a file's bytes, or None if it can't be read.
+
+    The content is cached per path and reused while the file's mtime and size are unchanged,
+    so repeated checks cost one os.stat() each.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        _file_cache.pop(path, None)
+        return None
+    cached = _file_cache.get(path)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    content, st = _read_bytes(path)
+    if content is None:
+        return None
+    _file_cache[path] = (st.st_mtime_ns, st.st_size, content)
+    return content
+
+
+def _write_bytes(path, content):
+    """Write content to path and drop its cached copy."""
+    with open(path, 'wb') as f:
+        f.write(content)
+    _file_cache.pop(path, None)
+
+
+def _file_contains(path, marker):
+    """Return whether the file at path contains marker (bytes), or None if it doesn't exist."""
+    content = _load(path)
+    if content is None:
+        return None
+    return marker in content
+
+
 def check_core_patched():
     """Check if core files have been patched with blueprint registration support.
 
@@ -26,22 +78,18 @@ def check_core_patched():
     missing = []
 
     registry_path = os.path.join(project_dir, "src", "plugins", "plugin_registry.py")
-    if os.path.exists(registry_path):
-        with open(registry_path, 'r') as f:
-            content = f.read()
-            if 'def register_plugin_blueprints(app):' not in content:
-                missing.append("plugin_registry.py: missing register_plugin_blueprints() function")
-    else:
+    found = _file_contains(registry_path, b'def register_plugin_blueprints(app):')
+    if found is None:
         missing.append("plugin_registry.py: file not found")
+    elif not found:
+        missing.append("plugin_registry.py: missing register_plugin_blueprints() function")
 
     inkypi_path = os.path.join(project_dir, "src", "inkypi.py")
-    if os.path.exists(inkypi_path):
-        with open(inkypi_path, 'r') as f:
-            content = f.read()
-            if 'register_plugin_blueprints' not in content:
-                missing.append("inkypi.py: missing register_plugin_blueprints import/call")
-    else:
+    found = _file_contains(inkypi_path, b'register_plugin_blueprints')
+    if found is None:
         missing.append("inkypi.py: file not found")
+    elif not found:
+        missing.append("inkypi.py: missing register_plugin_blueprints import/call")
 
     return len(missing) == 0, missing
 
@@ -56,13 +104,11 @@ def patch_core_files():
 
     try:
         registry_path = os.path.join(project_dir, "src", "plugins", "plugin_registry.py")
-        if not os.path.exists(registry_path):
+        registry_content = _load(registry_path)
+        if registry_content is None:
             return False, f"File not found: {registry_path}"
 
-        with open(registry_path, 'r') as f:
-            registry_content = f.read()
-
-        if 'def register_plugin_blueprints(app):' in registry_content:
+        if b'def register_plugin_blueprints(app):' in registry_content:
             logger.info("plugin_registry.py already patched")
         else:
             patch_function = '''
@@ -85,58 +131,58 @@ def register_plugin_blueprints(app):
                     logger.info(f"Registered blueprint for plugin '{plugin_id}'")
         except Exception as e:
             logger.warning(f"Failed to register blueprint for plugin '{plugin_id}': {e}")
-'''
+'''.encode()
             registry_content += patch_function
-            with open(registry_path, 'w') as f:
-                f.write(registry_content)
+            _write_bytes(registry_path, registry_content)
             logger.info("Patched plugin_registry.py")
 
         inkypi_path = os.path.join(project_dir, "src", "inkypi.py")
-        if not os.path.exists(inkypi_path):
+        inkypi_content = _load(inkypi_path)
+        if inkypi_content is None:
             return False, f"File not found: {inkypi_path}"
 
-        with open(inkypi_path, 'r') as f:
-            inkypi_content = f.read()
-
-        if 'register_plugin_blueprints(app)' in inkypi_content:
+        if b'register_plugin_blueprints(app)' in inkypi_content:
             logger.info("inkypi.py already patched")
         else:
-            if 'register_plugin_blueprints' not in inkypi_content:
-                import_line = 'from plugins.plugin_registry import load_plugins, get_plugin_instance, register_plugin_blueprints'
-                pattern = r'from plugins\.plugin_registry import [^\n]+'
-                if re.search(pattern, inkypi_content):
-                    inkypi_content = re.sub(pattern, import_line, inkypi_content)
+            if b'register_plugin_blueprints' not in inkypi_content:
+                import_line = b'from plugins.plugin_registry import load_plugins, get_plugin_instance, register_plugin_blueprints'
+                # Replace the existing registry import line (up to the newline) in place
+                start = inkypi_content.find(b'from plugins.plugin_registry import ')
+                if start >= 0:
+                    end = inkypi_content.find(b'\n', start)
+                    if end < 0:
+                        end = len(inkypi_content)
+                    inkypi_content = inkypi_content[:start] + import_line + inkypi_content[end:]
                 else:
-                    lines = inkypi_content.split('\n')
+                    lines = inkypi_content.split(b'\n')
                     insert_idx = None
                     for i, line in enumerate(lines):
-                        if 'from plugins.plugin_registry import' in line:
+                        if b'from plugins.plugin_registry import' in line:
                             insert_idx = i
                             break
-                        elif i > 30 and 'from waitress import serve' in line:
+                        elif i > 30 and b'from waitress import serve' in line:
                             insert_idx = i
                             break
                     if insert_idx is not None:
                         lines.insert(insert_idx, import_line)
-                        inkypi_content = '\n'.join(lines)
+                        inkypi_content = b'\n'.join(lines)
 
-            blueprint_section = '# Register Blueprints'
+            blueprint_section = b'# Register Blueprints'
             if blueprint_section in inkypi_content:
-                lines = inkypi_content.split('\n')
+                lines = inkypi_content.split(b'\n')
                 insert_idx = None
                 in_blueprint_section = False
                 for i, line in enumerate(lines):
-                    if '# Register Blueprints' in line:
+                    if b'# Register Blueprints' in line:
                         in_blueprint_section = True
-                    elif in_blueprint_section and (line.strip().startswith('#') or 'register_heif_opener' in line or 'if __name__' in line):
+                    elif in_blueprint_section and (line.strip().startswith(b'#') or b'register_heif_opener' in line or b'if __name__' in line):
                         insert_idx = i
                         break
                 if insert_idx:
-                    call_line = '\n# Register blueprints from plugins (generic mechanism - any plugin can expose blueprints)\nregister_plugin_blueprints(app)'
+                    call_line = b'\n# Register blueprints from plugins (generic mechanism - any plugin can expose blueprints)\nregister_plugin_blueprints(app)'
                     lines.insert(insert_idx, call_line)
-                    inkypi_content = '\n'.join(lines)
-            with open(inkypi_path, 'w') as f:
-                f.write(inkypi_content)
+                    inkypi_content = b'\n'.join(lines)
+            _write_bytes(inkypi_path, inkypi_content)
             logger.info("Patched inkypi.py")
 
         return True, None